@@ -69,7 +69,7 @@ class ProfileView(LoginRequiredMixin, DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile = self.get_object()
+        profile = self.object
         context['completion_percentage'] = profile.get_completion_percentage()
         context['is_own_profile'] = profile.user == self.request.user
         return context
@@ -14,14 +14,14 @@ class SkillCategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
-    list_display = ('name', 'category', 'is_popular', 'offered_count', 'desired_count', 'created_at')
+    list_display = ('name', 'category', 'is_popular', 'active_offered_count', 'desired_count', 'created_at')
     list_filter = ('category', 'is_popular', 'created_at')
     search_fields = ('name', 'description', 'category__name')
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'offered_count')
     
-    def offered_count(self, obj):
+    def active_offered_count(self, obj):
         return obj.offered_by_users.filter(is_active=True).count()
-    offered_count.short_description = 'Offered By'
+    active_offered_count.short_description = 'Offered By'
     
     def desired_count(self, obj):
         return obj.desired_by_users.filter(is_active=True).count()
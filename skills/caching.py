@@ -0,0 +1,134 @@
+import hashlib
+from functools import wraps
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count
+from django.utils.functional import cached_property
+from django.views.decorators.cache import cache_page
+
+from .models import Skill, SkillCategory
+
+# Catalogue data (categories and skills) changes rarely, so short-lived
+# cache entries are safe; signals in skills/signals.py clear them on writes.
+CATALOGUE_CACHE_TIMEOUT = 300
+
+ACTIVE_CATEGORIES_KEY = 'skill_categories_active'
+ACTIVE_CATEGORIES_WITH_COUNTS_KEY = 'active_categories_with_counts'
+TRENDING_SKILLS_KEY = 'trending_skills'
+TRENDING_SKILLS_COUNT_KEY = 'trending_skills_count'
+
+# Widgets slice the cached trending list, so one key serves every limit up to this
+TRENDING_SKILLS_MAX = 15
+
+# Autocomplete results are not invalidated on writes, so keep them short-lived
+AUTOCOMPLETE_CACHE_TIMEOUT = 60
+
+
+def skills_by_category_key(category_id):
+    return f'skills_by_cat:{category_id}'
+
+
+def autocomplete_cache_key(term):
+    # Hash the term so arbitrary user input always makes a valid cache key
+    return 'skill_ac:' + hashlib.md5(term.lower().encode()).hexdigest()
+
+
+def get_active_category_choices():
+    """Return (id, name) pairs for all active categories"""
+    return cache.get_or_set(
+        ACTIVE_CATEGORIES_KEY,
+        lambda: list(SkillCategory.objects.filter(is_active=True).values_list('id', 'name')),
+        CATALOGUE_CACHE_TIMEOUT,
+    )
+
+
+def get_active_categories_with_counts():
+    """Return active categories annotated with skill_count, ordered by name"""
+    # Meta.ordering is not applied to aggregating queries, so order explicitly
+    return cache.get_or_set(
+        ACTIVE_CATEGORIES_WITH_COUNTS_KEY,
+        lambda: list(SkillCategory.objects
+                     .filter(is_active=True)
+                     .annotate(skill_count=Count('skills'))
+                     .order_by('name')),
+        CATALOGUE_CACHE_TIMEOUT,
+    )
+
+
+def get_skills_for_category(category_id):
+    """Return [{'id': ..., 'name': ...}] for the skills in a category, ordered by name"""
+    return cache.get_or_set(
+        skills_by_category_key(category_id),
+        lambda: list(Skill.objects.filter(category_id=category_id).order_by('name').values('id', 'name')),
+        CATALOGUE_CACHE_TIMEOUT,
+    )
+
+
+def get_trending_skills(limit=TRENDING_SKILLS_MAX):
+    """Return the most offered skills in active categories, most offered first"""
+    trending_skills = cache.get_or_set(
+        TRENDING_SKILLS_KEY,
+        lambda: list(Skill.objects
+                     .filter(category__is_active=True, offered_count__gt=0)
+                     .select_related('category')
+                     .only('id', 'name', 'offered_count', 'category__name')
+                     .order_by('-offered_count', 'name')[:TRENDING_SKILLS_MAX]),
+        CATALOGUE_CACHE_TIMEOUT,
+    )
+    return trending_skills[:limit]
+
+
+def _delete_on_commit(keys):
+    # Deleting inside the write transaction would let a concurrent request re-cache
+    # pre-commit data for the full timeout; outside a transaction this runs immediately
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_category_cache():
+    _delete_on_commit([
+        ACTIVE_CATEGORIES_KEY, ACTIVE_CATEGORIES_WITH_COUNTS_KEY, TRENDING_SKILLS_KEY, TRENDING_SKILLS_COUNT_KEY,
+    ])
+
+
+def invalidate_skill_cache(category_id):
+    _delete_on_commit([
+        skills_by_category_key(category_id), ACTIVE_CATEGORIES_WITH_COUNTS_KEY,
+        TRENDING_SKILLS_KEY, TRENDING_SKILLS_COUNT_KEY,
+    ])
+
+
+def invalidate_trending_cache():
+    _delete_on_commit([TRENDING_SKILLS_KEY, TRENDING_SKILLS_COUNT_KEY])
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that keeps the total object count in the cache under cache_key"""
+    
+    def __init__(self, *args, cache_key, timeout=CATALOGUE_CACHE_TIMEOUT, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+        self.timeout = timeout
+    
+    @cached_property
+    def count(self):
+        count = cache.get(self.cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.cache_key, count, self.timeout)
+        return count
+
+
+def cache_page_for_anonymous(timeout):
+    """Like cache_page, but only serves and stores cached pages for anonymous users"""
+    def decorator(view_func):
+        cached_view = cache_page(timeout)(view_func)
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+            return cached_view(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
@@ -1,10 +1,26 @@
 from django import forms
 from .models import Skill, SkillCategory, OfferedSkill, DesiredSkill
+from .caching import get_active_category_choices, get_skills_for_category
+
+
+def set_cached_choices(field, choices):
+    """Render a ModelChoiceField from cached (id, label) pairs, keeping its empty option"""
+    if field.empty_label is not None:
+        choices = [('', field.empty_label), *choices]
+    field.choices = choices
+
+
+def use_cached_categories(field):
+    """Validate against active categories, but render the options from the cache"""
+    field.queryset = SkillCategory.objects.filter(is_active=True)
+    # Assigned after the queryset, whose setter would otherwise reset the choices
+    set_cached_choices(field, get_active_category_choices())
+
 
 class OfferedSkillForm(forms.ModelForm):
     """Form for creating/editing offered skills"""
     skill_category = forms.ModelChoiceField(
-        queryset=SkillCategory.objects.filter(is_active=True),
+        queryset=SkillCategory.objects.none(),
         required=True,
         label="Skill Category",
         help_text="Select the category for your skill",
@@ -31,11 +47,14 @@ class OfferedSkillForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # If form has data (like from POST), filter skills by category
+        use_cached_categories(self.fields['skill_category'])
+        
+        # If form has data (like from POST), only skills in the submitted category are valid.
+        # Options are rendered client-side, so the queryset is only used for validation.
         if 'skill_category' in self.data:
             try:
                 category_id = int(self.data.get('skill_category'))
-                self.fields['skill'].queryset = Skill.objects.filter(category_id=category_id).order_by('name')
+                self.fields['skill'].queryset = Skill.objects.filter(category_id=category_id)
             except (ValueError, TypeError):
                 pass
         # If instance exists (editing), set the category and filter skills
@@ -47,25 +66,19 @@ class OfferedSkillForm(forms.ModelForm):
         cleaned_data = super().clean()
         skill = cleaned_data.get('skill')
         skill_category = cleaned_data.get('skill_category')
-        user = getattr(self.instance, 'user', None)
         
         # Validate that skill belongs to selected category
-        if skill and skill_category and skill.category != skill_category:
+        if skill and skill_category and skill.category_id != skill_category.pk:
             raise forms.ValidationError('Selected skill does not belong to the selected category.')
         
-        # Check for duplicate skills for the user
-        if skill and user:
-            existing = OfferedSkill.objects.filter(user=user, skill=skill).exclude(pk=self.instance.pk if self.instance.pk else None)
-            if existing.exists():
-                raise forms.ValidationError(f'You already offer {skill.name}.')
-        
+        # Duplicate skills for the user are rejected by the uniq_user_offered_skill constraint
         return cleaned_data
 
 
 class DesiredSkillForm(forms.ModelForm):
     """Form for creating/editing desired skills"""
     skill_category = forms.ModelChoiceField(
-        queryset=SkillCategory.objects.filter(is_active=True),
+        queryset=SkillCategory.objects.none(),
         required=True,
         label="Skill Category",
         help_text="Select the category for the skill you want to learn",
@@ -93,11 +106,14 @@ class DesiredSkillForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # If form has data (like from POST), filter skills by category
+        use_cached_categories(self.fields['skill_category'])
+        
+        # If form has data (like from POST), only skills in the submitted category are valid.
+        # Options are rendered client-side, so the queryset is only used for validation.
         if 'skill_category' in self.data:
             try:
                 category_id = int(self.data.get('skill_category'))
-                self.fields['skill'].queryset = Skill.objects.filter(category_id=category_id).order_by('name')
+                self.fields['skill'].queryset = Skill.objects.filter(category_id=category_id)
             except (ValueError, TypeError):
                 pass
         # If instance exists (editing), set the category and filter skills
@@ -109,24 +125,19 @@ class DesiredSkillForm(forms.ModelForm):
         cleaned_data = super().clean()
         skill = cleaned_data.get('skill')
         skill_category = cleaned_data.get('skill_category')
-        user = getattr(self.instance, 'user', None)
         
         # Validate that skill belongs to selected category
-        if skill and skill_category and skill.category != skill_category:
+        if skill and skill_category and skill.category_id != skill_category.pk:
             raise forms.ValidationError('Selected skill does not belong to the selected category.')
         
-        if skill and user:
-            existing = DesiredSkill.objects.filter(user=user, skill=skill).exclude(pk=self.instance.pk if self.instance.pk else None)
-            if existing.exists():
-                raise forms.ValidationError(f'You already want to learn {skill.name}.')
-        
+        # Duplicate skills for the user are rejected by the uniq_user_desired_skill constraint
         return cleaned_data
 
 
 class SkillSearchForm(forms.Form):
     """Form for searching and filtering skills"""
     category = forms.ModelChoiceField(
-        queryset=SkillCategory.objects.filter(is_active=True), 
+        queryset=SkillCategory.objects.none(), 
         required=False, 
         empty_label="Select Category...",
         widget=forms.Select(attrs={'class': 'form-control'})
@@ -141,10 +152,15 @@ class SkillSearchForm(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
+        use_cached_categories(self.fields['category'])
+        
         # If form has data, filter skills by category
         if 'category' in self.data and self.data.get('category'):
             try:
                 category_id = int(self.data.get('category'))
                 self.fields['skill'].queryset = Skill.objects.filter(category_id=category_id).order_by('name')
+                set_cached_choices(self.fields['skill'], [
+                    (skill['id'], skill['name']) for skill in get_skills_for_category(category_id)
+                ])
             except (ValueError, TypeError):
-                pass 
\ No newline at end of file
+                pass
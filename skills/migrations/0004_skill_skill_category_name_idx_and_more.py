@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_alter_desiredskill_table_alter_offeredskill_table_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['category', 'name'], name='skill_category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillmatch',
+            index=models.Index(fields=['teacher', 'is_dismissed'], name='match_teacher_dismissed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillmatch',
+            index=models.Index(fields=['learner', 'is_dismissed'], name='match_learner_dismissed_idx'),
+        ),
+    ]
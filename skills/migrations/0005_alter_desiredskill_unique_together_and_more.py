@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0004_skill_skill_category_name_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='desiredskill',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='offeredskill',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='desiredskill',
+            constraint=models.UniqueConstraint(fields=('user', 'skill'), name='uniq_user_desired_skill'),
+        ),
+        migrations.AddConstraint(
+            model_name='offeredskill',
+            constraint=models.UniqueConstraint(fields=('user', 'skill'), name='uniq_user_offered_skill'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_offered_count(apps, schema_editor):
+    Skill = apps.get_model('skills', 'Skill')
+    OfferedSkill = apps.get_model('skills', 'OfferedSkill')
+    counts = OfferedSkill.objects.order_by().values('skill').annotate(total=Count('id'))
+    for row in counts:
+        Skill.objects.filter(pk=row['skill']).update(offered_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0006_skill_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='offered_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(populate_offered_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0007_skill_offered_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offeredskill',
+            index=models.Index(fields=['skill', 'is_active', '-average_rating', '-total_sessions'], name='offered_skill_tutors_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offeredskill',
+            index=models.Index(fields=['user', 'is_active'], name='offered_user_active_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0008_offeredskill_tutor_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skill',
+            name='offered_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['-offered_count', 'name'], name='skill_popularity_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.db.models import Avg, Q, Sum
+
+
+def populate_teacher_stats(apps, schema_editor):
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    OfferedSkill = apps.get_model('skills', 'OfferedSkill')
+    # Mirrors skills.signals.get_teacher_stats: the rating averages active offers,
+    # sessions are a lifetime total over every offer
+    stats = (OfferedSkill.objects
+             .order_by()
+             .values('user')
+             .annotate(avg_rating=Avg('average_rating', filter=Q(is_active=True)),
+                       total_sessions=Sum('total_sessions')))
+    for row in stats:
+        UserProfile.objects.filter(user_id=row['user']).update(
+            average_rating_as_teacher=row['avg_rating'] or 0,
+            total_sessions_taught=row['total_sessions'] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_userprofile_branch_alter_userprofile_department'),
+        ('skills', '0009_skill_popularity_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_teacher_stats, migrations.RunPython.noop),
+    ]
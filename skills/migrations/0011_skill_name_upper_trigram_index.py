@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_upper_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # Matches the UPPER("name"::text) LIKE UPPER(...) that icontains compiles to
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS skill_name_upper_trgm ON skills_skill '
+        'USING gin (UPPER(name::text) gin_trgm_ops)'
+    )
+
+
+def drop_upper_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS skill_name_upper_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0010_populate_teacher_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_upper_trigram_index, drop_upper_trigram_index),
+    ]
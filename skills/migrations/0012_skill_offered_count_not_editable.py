@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-15 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0011_skill_name_upper_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skill',
+            name='offered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
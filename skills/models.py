@@ -23,15 +23,32 @@ class Skill(models.Model):
     category = models.ForeignKey(SkillCategory, on_delete=models.CASCADE, related_name='skills')
     description = models.TextField(blank=True)
     is_popular = models.BooleanField(default=False)
+    # Denormalized count of OfferedSkill rows (active or not), maintained by skills/signals.py
+    offered_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['category__name', 'name']
         unique_together = ['name', 'category']
+        indexes = [
+            models.Index(fields=['category', 'name'], name='skill_category_name_idx'),
+            # Serves the popular sort and trending lists, ties included, without a sort step
+            models.Index(fields=['-offered_count', 'name'], name='skill_popularity_idx'),
+        ]
+        # On PostgreSQL, migrations 0006 and 0011 also add pg_trgm GIN indexes on name and
+        # UPPER(name) for the autocomplete; they are kept out of Meta so the schema still
+        # migrates on SQLite.
     
     def __str__(self):
         return f"{self.name} ({self.category.name})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored category so moving a skill also clears its old category's cache
+        instance._loaded_category_id = instance.__dict__.get('category_id')
+        return instance
 
 class OfferedSkill(models.Model):
     PROFICIENCY_LEVELS = [
@@ -62,11 +79,25 @@ class OfferedSkill(models.Model):
     
     class Meta:
         ordering = ['-created_at']
-        unique_together = ['user', 'skill']
         db_table = 'offeredskill'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'skill'], name='uniq_user_offered_skill'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'is_active', '-average_rating', '-total_sessions'],
+                         name='offered_skill_tutors_idx'),
+            models.Index(fields=['user', 'is_active'], name='offered_user_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} offers {self.skill.name}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored skill so Skill.offered_count can follow an offer moved to another skill
+        instance._loaded_skill_id = instance.__dict__.get('skill_id')
+        return instance
 
 class DesiredSkill(models.Model):
     URGENCY_LEVELS = [
@@ -93,8 +124,10 @@ class DesiredSkill(models.Model):
     
     class Meta:
         ordering = ['-created_at']
-        unique_together = ['user', 'skill']
         db_table = 'desiredskill'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'skill'], name='uniq_user_desired_skill'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} wants to learn {self.skill.name}"
@@ -115,6 +148,10 @@ class SkillMatch(models.Model):
         ordering = ['-compatibility_score', '-created_at']
         unique_together = ['teacher', 'learner', 'offered_skill', 'desired_skill']
         db_table = 'match'
+        indexes = [
+            models.Index(fields=['teacher', 'is_dismissed'], name='match_teacher_dismissed_idx'),
+            models.Index(fields=['learner', 'is_dismissed'], name='match_learner_dismissed_idx'),
+        ]
     
     def __str__(self):
         return f"Match: {self.teacher.username} → {self.learner.username} ({self.offered_skill.skill.name})"
@@ -0,0 +1,76 @@
+from django.db.models import Avg, F, Q, Sum
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import UserProfile
+
+from .models import Skill, SkillCategory, OfferedSkill
+from .caching import invalidate_category_cache, invalidate_skill_cache, invalidate_trending_cache
+
+
+@receiver([post_save, post_delete], sender=SkillCategory)
+def skill_category_changed(sender, instance, **kwargs):
+    invalidate_category_cache()
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def skill_changed(sender, instance, **kwargs):
+    invalidate_skill_cache(instance.category_id)
+    previous_category_id = getattr(instance, '_loaded_category_id', None)
+    if previous_category_id is not None and previous_category_id != instance.category_id:
+        invalidate_skill_cache(previous_category_id)
+    instance._loaded_category_id = instance.category_id
+
+
+def _adjust_offered_count(skill_id, delta):
+    # Clamp at zero so a drifted counter cannot fail the PositiveIntegerField check
+    Skill.objects.filter(pk=skill_id).update(offered_count=Greatest(F('offered_count') + delta, 0))
+    invalidate_trending_cache()
+
+
+def get_teacher_stats(user_id):
+    """Return the user's tutor rating and session totals.
+
+    avg_rating averages the offers currently listed (active ones), while
+    total_sessions is a lifetime figure summed over every offer, so pausing
+    an offer does not take back sessions already taught.
+    """
+    stats = OfferedSkill.objects.filter(user_id=user_id).aggregate(
+        avg_rating=Avg('average_rating', filter=Q(is_active=True)),
+        total_sessions=Sum('total_sessions'),
+    )
+    return {
+        'avg_rating': stats['avg_rating'] or 0,
+        'total_sessions': stats['total_sessions'] or 0,
+    }
+
+
+def refresh_teacher_stats(user_id):
+    """Store get_teacher_stats() on the user's profile"""
+    stats = get_teacher_stats(user_id)
+    UserProfile.objects.filter(user_id=user_id).update(
+        average_rating_as_teacher=stats['avg_rating'],
+        total_sessions_taught=stats['total_sessions'],
+    )
+
+
+@receiver(post_save, sender=OfferedSkill)
+def offered_skill_saved(sender, instance, created, raw=False, **kwargs):
+    # Fixtures already carry their own offered_count and profile totals
+    if raw:
+        return
+    previous_skill_id = getattr(instance, '_loaded_skill_id', None)
+    if created:
+        _adjust_offered_count(instance.skill_id, 1)
+    elif previous_skill_id is not None and previous_skill_id != instance.skill_id:
+        _adjust_offered_count(previous_skill_id, -1)
+        _adjust_offered_count(instance.skill_id, 1)
+    instance._loaded_skill_id = instance.skill_id
+    refresh_teacher_stats(instance.user_id)
+
+
+@receiver(post_delete, sender=OfferedSkill)
+def offered_skill_deleted(sender, instance, **kwargs):
+    _adjust_offered_count(instance.skill_id, -1)
+    refresh_teacher_stats(instance.user_id)
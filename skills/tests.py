@@ -1,3 +1,423 @@
-from django.test import TestCase
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.core import serializers
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import UserProfile
+from .caching import (
+    TRENDING_SKILLS_COUNT_KEY, CachedCountPaginator,
+    get_active_categories_with_counts, get_active_category_choices, get_skills_for_category, get_trending_skills,
+)
+from .views import SkillMatchListView
+from .models import SkillCategory, Skill, OfferedSkill, DesiredSkill, SkillMatch
+
+
+class SkillTestMixin:
+    """Shared fixtures: two skills in one category and a helper to create users"""
+
+    def setUp(self):
+        self.category = SkillCategory.objects.create(name='Programming')
+        self.python = Skill.objects.create(name='Python', category=self.category)
+        self.django = Skill.objects.create(name='Django', category=self.category)
+
+    def create_user(self, username):
+        user = User.objects.create_user(username, password='testpass123')
+        UserProfile.objects.create(user=user, university_email=f'{username}@example.edu')
+        return user
+
+
+class DismissSkillMatchTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.teacher = self.create_user('teacher')
+        self.learner = self.create_user('learner')
+        self.match = SkillMatch.objects.create(
+            teacher=self.teacher,
+            learner=self.learner,
+            offered_skill=OfferedSkill.objects.create(user=self.teacher, skill=self.python),
+            desired_skill=DesiredSkill.objects.create(user=self.learner, skill=self.python),
+        )
+        self.url = reverse('skills:match_dismiss', args=[self.match.pk])
+
+    def test_non_participant_gets_404(self):
+        self.create_user('stranger')
+        self.client.login(username='stranger', password='testpass123')
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+        self.match.refresh_from_db()
+        self.assertFalse(self.match.is_dismissed)
+
+    def test_participant_can_dismiss(self):
+        self.client.login(username='learner', password='testpass123')
+
+        response = self.client.get(self.url)
+
+        self.assertRedirects(response, reverse('skills:match_list'), fetch_redirect_response=False)
+        self.match.refresh_from_db()
+        self.assertTrue(self.match.is_dismissed)
+
+
+class ToggleOfferedSkillTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user('tutor')
+        self.offered = OfferedSkill.objects.create(
+            user=self.user, skill=self.python, average_rating=4.0, total_sessions=6
+        )
+        OfferedSkill.objects.create(user=self.user, skill=self.django, average_rating=2.0, total_sessions=4)
+        self.url = reverse('skills:offered_toggle', args=[self.offered.pk])
+        self.client.login(username='tutor', password='testpass123')
+
+    def test_toggle_flips_is_active(self):
+        self.client.get(self.url)
+        self.offered.refresh_from_db()
+        self.assertFalse(self.offered.is_active)
+
+        self.client.get(self.url)
+        self.offered.refresh_from_db()
+        self.assertTrue(self.offered.is_active)
+
+    def test_toggle_refreshes_rating_but_keeps_lifetime_sessions(self):
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual(profile.average_rating_as_teacher, 3.0)
+        self.assertEqual(profile.total_sessions_taught, 10)
+
+        self.client.get(self.url)
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.average_rating_as_teacher, 2.0)
+        self.assertEqual(profile.total_sessions_taught, 10)
+
+        self.client.get(self.url)
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.average_rating_as_teacher, 3.0)
+        self.assertEqual(profile.total_sessions_taught, 10)
+
+    def test_toggle_other_users_skill_gets_404(self):
+        other = self.create_user('other')
+        other_offered = OfferedSkill.objects.create(user=other, skill=self.python)
+
+        response = self.client.get(reverse('skills:offered_toggle', args=[other_offered.pk]))
+
+        self.assertEqual(response.status_code, 404)
+        other_offered.refresh_from_db()
+        self.assertTrue(other_offered.is_active)
+
+
+class OfferedCountTests(SkillTestMixin, TestCase):
+
+    def assertOfferedCounts(self, python, django):
+        self.python.refresh_from_db()
+        self.django.refresh_from_db()
+        self.assertEqual((self.python.offered_count, self.django.offered_count), (python, django))
+
+    def test_create_move_and_delete_keep_offered_count(self):
+        alice = self.create_user('alice')
+        bob = self.create_user('bob')
+
+        offered = OfferedSkill.objects.create(user=alice, skill=self.python)
+        OfferedSkill.objects.create(user=bob, skill=self.python)
+        self.assertOfferedCounts(2, 0)
+
+        offered = OfferedSkill.objects.get(pk=offered.pk)
+        offered.skill = self.django
+        offered.save()
+        self.assertOfferedCounts(1, 1)
+
+        offered.delete()
+        self.assertOfferedCounts(1, 0)
+
+        OfferedSkill.objects.filter(user=bob).delete()
+        self.assertOfferedCounts(0, 0)
+
+    def test_raw_fixture_save_does_not_adjust_offered_count(self):
+        offered = OfferedSkill.objects.create(user=self.create_user('alice'), skill=self.python)
+        fixture = serializers.serialize('json', [offered])
+        self.assertOfferedCounts(1, 0)
+
+        for obj in serializers.deserialize('json', fixture):
+            obj.save()
+
+        self.assertOfferedCounts(1, 0)
+
+    def test_delete_with_drifted_counter_clamps_at_zero(self):
+        offered = OfferedSkill.objects.create(user=self.create_user('alice'), skill=self.python)
+        Skill.objects.filter(pk=self.python.pk).update(offered_count=0)
+
+        offered.delete()
+
+        self.assertOfferedCounts(0, 0)
+
+    def test_offered_count_is_read_only_in_admin(self):
+        request = RequestFactory().get('/admin/')
+        request.user = User.objects.create_superuser('admin', password='testpass123')
+        skill_admin = site._registry[Skill]
+
+        form = skill_admin.get_form(request, self.python)
+
+        self.assertNotIn('offered_count', form.base_fields)
+        self.assertIn('offered_count', skill_admin.get_readonly_fields(request, self.python))
+
+
+class SkillsByCategoryPublicTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.url = reverse('skills:get_skills_by_category_public') + f'?category_id={self.category.pk}'
+
+    def test_matching_etag_gets_304_on_a_page_cache_hit(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header('ETag'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(response.status_code, 304)
+
+
+class TeacherStatsTests(SkillTestMixin, TestCase):
+
+    def test_profile_stats_follow_offer_saves_and_deletes(self):
+        user = self.create_user('tutor')
+        offered = OfferedSkill.objects.create(user=user, skill=self.python, average_rating=5.0, total_sessions=3)
+        OfferedSkill.objects.create(user=user, skill=self.django, is_active=False, average_rating=1.0, total_sessions=2)
+        profile = UserProfile.objects.get(user=user)
+        self.assertEqual((profile.average_rating_as_teacher, profile.total_sessions_taught), (5.0, 5))
+
+        offered.delete()
+
+        profile.refresh_from_db()
+        self.assertEqual((profile.average_rating_as_teacher, profile.total_sessions_taught), (0, 2))
+
+    def test_tutor_profile_reads_stats_from_profile(self):
+        user = self.create_user('tutor')
+        OfferedSkill.objects.create(user=user, skill=self.python, average_rating=4.0, total_sessions=3)
+        OfferedSkill.objects.create(user=user, skill=self.django, is_active=False, average_rating=1.0, total_sessions=2)
+
+        response = self.client.get(reverse('skills:tutor_profile', args=[user.pk]))
+
+        self.assertEqual(response.context['overall_rating'], 4.0)
+        self.assertEqual(response.context['total_sessions'], 5)
+
+
+class SkillsByCategoryCacheTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.music = SkillCategory.objects.create(name='Music')
+
+    def skill_names(self, category):
+        return [skill['name'] for skill in get_skills_for_category(category.pk)]
+
+    def test_new_skill_appears_after_commit(self):
+        self.assertEqual(self.skill_names(self.category), ['Django', 'Python'])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Skill.objects.create(name='Rust', category=self.category)
+            # Still cached until the write commits
+            self.assertEqual(self.skill_names(self.category), ['Django', 'Python'])
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.skill_names(self.category), ['Django', 'Python', 'Rust'])
+
+    def test_moved_skill_leaves_old_category_list(self):
+        self.assertEqual(self.skill_names(self.category), ['Django', 'Python'])
+        self.assertEqual(self.skill_names(self.music), [])
+
+        skill = Skill.objects.get(pk=self.python.pk)
+        skill.category = self.music
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.save()
+
+        self.assertEqual(self.skill_names(self.category), ['Django'])
+        self.assertEqual(self.skill_names(self.music), ['Python'])
+
+
+class DuplicateSkillSubmitTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user('student')
+        self.client.login(username='student', password='testpass123')
+
+    def test_adding_an_already_offered_skill_shows_form_error(self):
+        OfferedSkill.objects.create(user=self.user, skill=self.python)
+
+        response = self.client.post(reverse('skills:add_skill'), {
+            'skill_category': self.category.pk,
+            'skill': self.python.pk,
+            'proficiency_level': 'expert',
+            'years_of_experience': 1,
+            'teaching_preference': 'both',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context['form'], 'skill', 'You already offer Python.')
+        self.assertEqual(OfferedSkill.objects.filter(user=self.user).count(), 1)
+
+    def test_editing_into_an_already_desired_skill_shows_form_error(self):
+        DesiredSkill.objects.create(user=self.user, skill=self.python)
+        desired = DesiredSkill.objects.create(user=self.user, skill=self.django)
+
+        response = self.client.post(reverse('skills:desired_edit', args=[desired.pk]), {
+            'skill_category': self.category.pk,
+            'skill': self.python.pk,
+            'urgency': 'medium',
+            'current_level': 'beginner',
+            'target_level': 'intermediate',
+            'learning_preference': 'both',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context['form'], 'skill', 'You already want to learn Python.')
+        desired.refresh_from_db()
+        self.assertEqual(desired.skill, self.django)
+
+
+class SkillMatchListTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user('student')
+        self.other = self.create_user('other')
+
+    def create_match(self, teacher, learner, skill=None, **kwargs):
+        skill = skill or self.python
+        return SkillMatch.objects.create(
+            teacher=teacher,
+            learner=learner,
+            offered_skill=OfferedSkill.objects.get_or_create(user=teacher, skill=skill)[0],
+            desired_skill=DesiredSkill.objects.get_or_create(user=learner, skill=skill)[0],
+            **kwargs
+        )
+
+    def get_matches(self):
+        view = SkillMatchListView()
+        view.setup(RequestFactory().get('/'))
+        view.request.user = self.user
+        return list(view.get_queryset())
+
+    def test_lists_both_sides_once_including_self_matches(self):
+        teaching = self.create_match(self.user, self.other, compatibility_score=0.9)
+        learning = self.create_match(self.other, self.user, compatibility_score=0.5)
+        own = self.create_match(self.user, self.user, compatibility_score=0.7)
+        self.create_match(self.other, self.other)
+        self.create_match(self.user, self.other, skill=self.django, is_dismissed=True)
+
+        self.assertEqual(self.get_matches(), [teaching, own, learning])
+
+
+class CategoryCacheTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def category_counts(self):
+        return [(category.name, category.skill_count) for category in get_active_categories_with_counts()]
+
+    def test_new_category_appears_after_commit(self):
+        self.assertEqual(get_active_category_choices(), [(self.category.pk, 'Programming')])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            music = SkillCategory.objects.create(name='Music')
+            # Still cached until the write commits
+            self.assertEqual(get_active_category_choices(), [(self.category.pk, 'Programming')])
+
+        self.assertEqual(
+            sorted(get_active_category_choices()), [(self.category.pk, 'Programming'), (music.pk, 'Music')]
+        )
+
+    def test_skill_counts_refresh_after_commit(self):
+        self.assertEqual(self.category_counts(), [('Programming', 2)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Rust', category=self.category)
+            self.assertEqual(self.category_counts(), [('Programming', 2)])
+
+        self.assertEqual(self.category_counts(), [('Programming', 3)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.is_active = False
+            self.category.save()
+
+        self.assertEqual(self.category_counts(), [])
+
+
+class TrendingSkillsCacheTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.alice = self.create_user('alice')
+
+    def trending_names(self, limit=15):
+        return [skill.name for skill in get_trending_skills(limit)]
+
+    def test_new_offer_updates_trending_after_commit(self):
+        OfferedSkill.objects.create(user=self.alice, skill=self.django)
+        self.assertEqual(self.trending_names(), ['Django'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            OfferedSkill.objects.create(user=self.alice, skill=self.python)
+            OfferedSkill.objects.create(user=self.create_user('bob'), skill=self.python)
+            # Still cached until the write commits
+            self.assertEqual(self.trending_names(), ['Django'])
+
+        self.assertEqual(self.trending_names(), ['Python', 'Django'])
+        self.assertEqual(self.trending_names(limit=1), ['Python'])
+
+    def test_deactivated_category_leaves_trending(self):
+        OfferedSkill.objects.create(user=self.alice, skill=self.python)
+        self.assertEqual(self.trending_names(), ['Python'])
+
+        self.category.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+
+        self.assertEqual(self.trending_names(), [])
+
+
+class CachedCountPaginatorTests(SkillTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def paginator(self):
+        queryset = Skill.objects.filter(offered_count__gt=0).order_by('name')
+        return CachedCountPaginator(queryset, 20, cache_key=TRENDING_SKILLS_COUNT_KEY)
+
+    def test_count_is_cached_until_an_offer_commits(self):
+        alice = self.create_user('alice')
+        OfferedSkill.objects.create(user=alice, skill=self.python)
+        self.assertEqual(self.paginator().count, 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.paginator().count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            OfferedSkill.objects.create(user=alice, skill=self.django)
+
+        self.assertEqual(self.paginator().count, 2)
+
+    def test_trending_more_view_uses_cached_count(self):
+        OfferedSkill.objects.create(user=self.create_user('alice'), skill=self.python)
+        self.create_user('viewer')
+        self.client.login(username='viewer', password='testpass123')
+        cache.set(TRENDING_SKILLS_COUNT_KEY, 41)
+
+        response = self.client.get(reverse('skills:trending_skills_more'))
+
+        self.assertIsInstance(response.context['paginator'], CachedCountPaginator)
+        self.assertEqual(response.context['paginator'].num_pages, 3)
@@ -1,28 +1,49 @@
+import orjson
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import conditional_page
+from django.views.generic import View, ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.http import JsonResponse
-from django.db.models import Count, Avg
+from django.http import Http404, HttpResponse
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
 
 from .models import Skill, SkillCategory, OfferedSkill, DesiredSkill, SkillMatch
 from .forms import OfferedSkillForm, DesiredSkillForm, SkillSearchForm
+from .signals import get_teacher_stats, refresh_teacher_stats
+from .caching import (
+    AUTOCOMPLETE_CACHE_TIMEOUT, CATALOGUE_CACHE_TIMEOUT, TRENDING_SKILLS_COUNT_KEY, CachedCountPaginator,
+    autocomplete_cache_key, cache_page_for_anonymous, get_active_categories_with_counts,
+    get_skills_for_category, get_trending_skills,
+)
 
 # Create your views here.
 
+@method_decorator(cache_page_for_anonymous(CATALOGUE_CACHE_TIMEOUT), name='dispatch')
 class SkillListView(ListView):
     model = Skill
     template_name = 'skills/skill_list.html'
     context_object_name = 'skills'
     paginate_by = 20
     
-    def get_queryset(self):
-        queryset = Skill.objects.filter(category__is_active=True).annotate(
-            offered_count=Count('offered_by_users')
+    def _active_skills(self):
+        return Skill.objects.filter(category__is_active=True).select_related('category').only(
+            'id', 'name', 'description', 'offered_count',
+            'category__name', 'category__icon', 'category__color'
         )
+    
+    def get_queryset(self):
+        queryset = self._active_skills()
         
         # Get filter parameters
         category = self.request.GET.get('category')
@@ -61,83 +82,121 @@ class SkillListView(ListView):
         
         if show_trending:
             # Get trending skills based on most offered skills (limited to 15)
-            trending_skills = (Skill.objects
-                              .filter(category__is_active=True)
-                              .annotate(offered_count=Count('offered_by_users'))
-                              .filter(offered_count__gt=0)
-                              .order_by('-offered_count', 'name')[:15])
-            context['trending_skills'] = trending_skills
+            context['trending_skills'] = get_trending_skills(15)
         
         # Get all categories for browse section
-        context['categories'] = SkillCategory.objects.filter(is_active=True).annotate(
-            skill_count=Count('skills')
-        )
+        context['categories'] = get_active_categories_with_counts()
         
-        # Add filter information for display
-        if self.request.GET.get('category'):
-            try:
-                selected_category = SkillCategory.objects.get(id=self.request.GET.get('category'))
-                context['selected_category'] = selected_category
-            except SkillCategory.DoesNotExist:
-                pass
+        # Add filter information for display. Labels are resolved from data
+        # already in hand where possible and otherwise loaded lazily, so the
+        # template only pays for the labels it actually renders
+        category_id = self.request.GET.get('category')
+        skill_id = self.request.GET.get('skill')
         
-        if self.request.GET.get('skill'):
-            try:
-                selected_skill = Skill.objects.get(id=self.request.GET.get('skill'))
-                context['selected_skill'] = selected_skill
-            except Skill.DoesNotExist:
-                pass
+        if skill_id:
+            context['selected_skill'] = SimpleLazyObject(
+                lambda: self._get_selected_skill(skill_id, context['page_obj'].object_list)
+            )
+        
+        if category_id:
+            context['selected_category'] = SimpleLazyObject(
+                lambda: self._get_selected_category(category_id, context['categories'])
+            )
         
         context['show_more_url'] = 'skills:trending_skills_more'
         
         return context
+    
+    def _get_selected_skill(self, skill_id, object_list):
+        # Filtering by skill leaves at most that skill on the page, so reuse it
+        for skill in object_list:
+            if str(skill.id) == skill_id:
+                return skill
+        # Clear the default ordering, which would join category just to sort one row
+        skills_by_id = Skill.objects.order_by().only('id', 'name', 'category_id').in_bulk([skill_id])
+        return next(iter(skills_by_id.values()), None)
+    
+    def _get_selected_category(self, category_id, categories):
+        # Active categories are cached; only inactive ones need a lookup
+        cat_map = {category.id: category for category in categories}
+        try:
+            return cat_map[int(category_id)]
+        except (KeyError, ValueError):
+            return SkillCategory.objects.filter(id=category_id).first()
 
 
+@method_decorator(cache_page_for_anonymous(CATALOGUE_CACHE_TIMEOUT), name='dispatch')
 class SkillCategoryListView(ListView):
     model = SkillCategory   
     template_name = 'skills/category_list.html'
     context_object_name = 'categories'
     
     def get_queryset(self):
-        return SkillCategory.objects.filter(is_active=True)
+        return get_active_categories_with_counts()
 
 
+@method_decorator(cache_page_for_anonymous(CATALOGUE_CACHE_TIMEOUT), name='dispatch')
 class SkillCategoryDetailView(DetailView):
     model = SkillCategory
     template_name = 'skills/category_detail.html'
     context_object_name = 'category'
+    pk_url_kwarg = 'category_id'
+
+
+class DuplicateSkillMixin:
+    """Report a duplicate (user, skill) pair as a form error instead of a server error"""
+    duplicate_message = 'You already have {skill}.'
+    
+    def form_valid(self, form):
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except IntegrityError:
+            form.add_error('skill', self.duplicate_message.format(skill=form.cleaned_data['skill'].name))
+            return self.form_invalid(form)
 
 
 class OfferedSkillListView(LoginRequiredMixin, ListView):
     model = OfferedSkill
     template_name = 'skills/offered_list.html'
     context_object_name = 'offered_skills'
+    paginate_by = 20
     
     def get_queryset(self):
-        return OfferedSkill.objects.filter(user=self.request.user)
+        return (OfferedSkill.objects
+                .filter(user=self.request.user)
+                .select_related('skill', 'skill__category')
+                .only('id', 'proficiency_level', 'description', 'years_of_experience',
+                      'teaching_preference', 'total_sessions', 'average_rating',
+                      'skill__name', 'skill__category__name')
+                .order_by('-id'))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['desired_skills'] = self.request.user.desired_skills.all()
+        context['desired_skills'] = (DesiredSkill.objects
+                                     .filter(user=self.request.user)
+                                     .select_related('skill__category'))
         return context
 
 
-class OfferedSkillCreateView(LoginRequiredMixin, CreateView):
+class OfferedSkillCreateView(LoginRequiredMixin, DuplicateSkillMixin, CreateView):
     model = OfferedSkill
     form_class = OfferedSkillForm
     template_name = 'skills/offered_form.html'
     success_url = reverse_lazy('skills:offered_list')
+    duplicate_message = 'You already offer {skill}.'
     
     def form_valid(self, form):
         form.instance.user = self.request.user
         return super().form_valid(form)
 
 
-class OfferedSkillUpdateView(LoginRequiredMixin, UpdateView):
+class OfferedSkillUpdateView(LoginRequiredMixin, DuplicateSkillMixin, UpdateView):
     model = OfferedSkill
     form_class = OfferedSkillForm
     template_name = 'skills/offered_form.html'
     success_url = reverse_lazy('skills:offered_list')
+    duplicate_message = 'You already offer {skill}.'
     
     def get_queryset(self):
         return OfferedSkill.objects.filter(user=self.request.user)
@@ -152,11 +211,21 @@ class OfferedSkillDeleteView(LoginRequiredMixin, DeleteView):
         return OfferedSkill.objects.filter(user=self.request.user)
 
 
+def _toggle_is_active(queryset):
+    """Flip is_active in a single UPDATE, raising Http404 if nothing matched"""
+    updated = queryset.update(
+        is_active=~F('is_active'),
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        raise Http404
+
+
 @login_required
 def toggle_offered_skill(request, pk):
-    offered_skill = get_object_or_404(OfferedSkill, pk=pk, user=request.user)
-    offered_skill.is_active = not offered_skill.is_active
-    offered_skill.save()
+    _toggle_is_active(OfferedSkill.objects.filter(pk=pk, user=request.user))
+    # The UPDATE bypasses save signals, and only active offers count towards the rating
+    refresh_teacher_stats(request.user.pk)
     return redirect('skills:offered_list')
 
 
@@ -164,27 +233,33 @@ class DesiredSkillListView(LoginRequiredMixin, ListView):
     model = DesiredSkill
     template_name = 'skills/desired_list.html'
     context_object_name = 'desired_skills'
+    paginate_by = 20
     
     def get_queryset(self):
-        return DesiredSkill.objects.filter(user=self.request.user)
+        return (DesiredSkill.objects
+                .filter(user=self.request.user)
+                .select_related('skill__category')
+                .order_by('-id'))
 
 
-class DesiredSkillCreateView(LoginRequiredMixin, CreateView):
+class DesiredSkillCreateView(LoginRequiredMixin, DuplicateSkillMixin, CreateView):
     model = DesiredSkill
     form_class = DesiredSkillForm
     template_name = 'skills/desired_form.html'
     success_url = reverse_lazy('skills:desired_list')
+    duplicate_message = 'You already want to learn {skill}.'
     
     def form_valid(self, form):
         form.instance.user = self.request.user
         return super().form_valid(form)
 
 
-class DesiredSkillUpdateView(LoginRequiredMixin, UpdateView):
+class DesiredSkillUpdateView(LoginRequiredMixin, DuplicateSkillMixin, UpdateView):
     model = DesiredSkill
     form_class = DesiredSkillForm
     template_name = 'skills/desired_form.html'
     success_url = reverse_lazy('skills:desired_list')
+    duplicate_message = 'You already want to learn {skill}.'
     
     def get_queryset(self):
         return DesiredSkill.objects.filter(user=self.request.user)
@@ -201,9 +276,7 @@ class DesiredSkillDeleteView(LoginRequiredMixin, DeleteView):
 
 @login_required
 def toggle_desired_skill(request, pk):
-    desired_skill = get_object_or_404(DesiredSkill, pk=pk, user=request.user)
-    desired_skill.is_active = not desired_skill.is_active
-    desired_skill.save()
+    _toggle_is_active(DesiredSkill.objects.filter(pk=pk, user=request.user))
     return redirect('skills:desired_list')
 
 
@@ -211,41 +284,76 @@ class SkillMatchListView(LoginRequiredMixin, ListView):
     model = SkillMatch
     template_name = 'skills/match_list.html'
     context_object_name = 'matches'
+    paginate_by = 20
     
     def get_queryset(self):
-        from django.db.models import Q
-        return SkillMatch.objects.filter(
-            Q(teacher=self.request.user) | Q(learner=self.request.user),
-            is_dismissed=False
-        )
+        # A UNION of the teacher and learner sides lets each leg use its own
+        # (user, is_dismissed) index, which an OR across two columns cannot.
+        # The legs only overlap on self-matches, so excluding those from the
+        # learner side allows UNION ALL and skips the de-duplication pass.
+        matches = SkillMatch.objects.filter(is_dismissed=False).select_related(
+            'teacher', 'learner', 'offered_skill__skill', 'desired_skill__skill'
+        ).order_by()
+        user = self.request.user
+        return (matches.filter(teacher=user)
+                .union(matches.filter(learner=user).exclude(teacher=user), all=True)
+                .order_by('-compatibility_score', '-created_at', '-id'))
 
 
 @login_required
 def dismiss_skill_match(request, pk):
-    match = get_object_or_404(SkillMatch, pk=pk)
-    match.is_dismissed = True
-    match.save()
+    # Only the teacher or learner of a match may dismiss it
+    updated = (SkillMatch.objects
+               .filter(Q(teacher=request.user) | Q(learner=request.user), pk=pk)
+               .update(is_dismissed=True, updated_at=timezone.now()))
+    if not updated:
+        raise Http404
     return redirect('skills:match_list')
 
 
-class SkillAutocompleteView(LoginRequiredMixin, ListView):
-    model = Skill
+class FastJsonResponse(HttpResponse):
+    """JsonResponse equivalent that serializes with orjson"""
+    
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(orjson.dumps(data), **kwargs)
+
+
+@method_decorator(conditional_page, name='dispatch')
+class SkillAutocompleteView(LoginRequiredMixin, View):
+    # Shorter terms share too few trigrams with skill names to match reliably
+    trigram_min_length = 3
     
     def get_queryset(self):
         term = self.request.GET.get('term', '')
-        return Skill.objects.filter(name__icontains=term)[:10]
+        # Order by name alone; the model's default ordering would join category
+        if len(term) < self.trigram_min_length:
+            return Skill.objects.filter(name__istartswith=term).order_by('name')[:10]
+        if connection.vendor == 'postgresql':
+            # Keep every icontains match and add fuzzy word matches (pg_trgm's <% operator),
+            # ranked by word similarity. Both legs are served by the trigram GIN indexes
+            # from migrations 0006 (name) and 0011 (UPPER(name), used by icontains).
+            return (Skill.objects
+                    .filter(Q(name__icontains=term) | Q(TrigramWordSimilar(F('name'), term)))
+                    .annotate(similarity=TrigramWordSimilarity(term, 'name'))
+                    .order_by('-similarity', 'name')[:10])
+        return Skill.objects.filter(name__icontains=term).order_by('name')[:10]
     
     def get(self, request, *args, **kwargs):
-        skills = self.get_queryset()
-        data = [{'id': skill.id, 'text': skill.name} for skill in skills]
-        return JsonResponse({'results': data})
+        data = cache.get_or_set(
+            autocomplete_cache_key(request.GET.get('term', '')),
+            lambda: list(self.get_queryset().values('id', text=F('name'))),
+            AUTOCOMPLETE_CACHE_TIMEOUT,
+        )
+        return FastJsonResponse({'results': data}, headers={'Cache-Control': 'private, max-age=30'})
 
 
-class AddSkillView(LoginRequiredMixin, CreateView):
+class AddSkillView(LoginRequiredMixin, DuplicateSkillMixin, CreateView):
     model = OfferedSkill
     form_class = OfferedSkillForm
     template_name = 'skills/add_skill.html'
     success_url = '/skills/offered/'
+    duplicate_message = 'You already offer {skill}.'
 
     def form_valid(self, form):
         form.instance.user = self.request.user
@@ -254,34 +362,30 @@ class AddSkillView(LoginRequiredMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Get trending skills (top 10 by offered count)
-        trending_skills = (Skill.objects
-                         .filter(category__is_active=True)
-                         .annotate(offered_count=Count('offered_by_users'))
-                         .filter(offered_count__gt=0)
-                         .order_by('-offered_count', 'name')[:10])
-        context['trending_skills'] = trending_skills
+        context['trending_skills'] = get_trending_skills(10)
         return context
 
 
+def _skills_by_category_response(request):
+    try:
+        category_id = int(request.GET.get('category_id', ''))
+    except ValueError:
+        return FastJsonResponse({'skills': []})
+    return FastJsonResponse({'skills': get_skills_for_category(category_id)})
+
+
 @login_required
+@conditional_page
 def get_skills_by_category(request):
     """AJAX view to get skills by category"""
-    category_id = request.GET.get('category_id')
-    if category_id:
-        skills = Skill.objects.filter(category_id=category_id).order_by('name')
-        data = [{'id': skill.id, 'name': skill.name} for skill in skills]
-        return JsonResponse({'skills': data})
-    return JsonResponse({'skills': []})
+    return _skills_by_category_response(request)
 
 
+@conditional_page
+@cache_page(60)
 def get_skills_by_category_public(request):
     """Public AJAX view to get skills by category for search form"""
-    category_id = request.GET.get('category_id')
-    if category_id:
-        skills = Skill.objects.filter(category_id=category_id).order_by('name')
-        data = [{'id': skill.id, 'name': skill.name} for skill in skills]
-        return JsonResponse({'skills': data})
-    return JsonResponse({'skills': []})
+    return _skills_by_category_response(request)
 
 
 class TrendingSkillsMoreView(LoginRequiredMixin, ListView):
@@ -290,15 +394,18 @@ class TrendingSkillsMoreView(LoginRequiredMixin, ListView):
     template_name = 'skills/trending_skills_more.html'
     context_object_name = 'trending_skills'
     paginate_by = 20
+    paginator_class = CachedCountPaginator
     
     def get_queryset(self):
-        from django.db.models import Count
         return (Skill.objects
-                .filter(category__is_active=True)
-                .annotate(offered_count=Count('offered_by_users'))
-                .filter(offered_count__gt=0)
+                .filter(category__is_active=True, offered_count__gt=0)
+                .select_related('category')
+                .only('id', 'name', 'description', 'offered_count', 'category__name')
                 .order_by('-offered_count', 'name'))
     
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(*args, cache_key=TRENDING_SKILLS_COUNT_KEY, **kwargs)
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['page_title'] = 'All Trending Skills'
@@ -308,21 +415,23 @@ class TrendingSkillsMoreView(LoginRequiredMixin, ListView):
 class SkillDetailView(DetailView):
     """View to show skill details with tutors and find tutors option"""
     model = Skill
+    queryset = Skill.objects.select_related('category')
     template_name = 'skills/skill_detail.html'
     context_object_name = 'skill'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        skill = self.get_object()
+        skill = self.object
         
         # Get tutors offering this skill (top 3 by rating)
-        top_tutors = (OfferedSkill.objects
-                     .filter(skill=skill, is_active=True)
-                     .select_related('user')
-                     .order_by('-average_rating', '-total_sessions')[:3])
+        tutors = OfferedSkill.objects.filter(skill=skill, is_active=True)
+        top_tutors = list(tutors
+                          .select_related('user')
+                          .order_by('-average_rating', '-total_sessions')[:3])
         
         context['top_tutors'] = top_tutors
-        context['total_tutors'] = OfferedSkill.objects.filter(skill=skill, is_active=True).count()
+        # A short slice already holds every tutor, so only count when it may be truncated
+        context['total_tutors'] = len(top_tutors) if len(top_tutors) < 3 else tutors.count()
         
         return context
 
@@ -336,43 +445,54 @@ class FindTutorsView(ListView):
     
     def get_queryset(self):
         skill_id = self.kwargs['skill_id']
+        # The template takes skill details from the context skill, so only the tutor is joined
         return (OfferedSkill.objects
                 .filter(skill_id=skill_id, is_active=True)
-                .select_related('user', 'skill')
+                .select_related('user')
+                .only('id', 'proficiency_level', 'description', 'years_of_experience',
+                      'teaching_preference', 'average_rating', 'total_sessions',
+                      'user__username', 'user__first_name', 'user__last_name')
                 .order_by('-average_rating', '-total_sessions'))
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         skill_id = self.kwargs['skill_id']
-        context['skill'] = get_object_or_404(Skill, id=skill_id)
+        context['skill'] = get_object_or_404(Skill.objects.select_related('category'), id=skill_id)
         return context
 
 
 class TutorProfileView(DetailView):
     """View to show tutor profile with skills and rating"""
     model = User
+    queryset = User.objects.select_related('profile')
     template_name = 'skills/tutor_profile.html'
     context_object_name = 'tutor'
     pk_url_kwarg = 'user_id'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        tutor = self.get_object()
+        tutor = self.object
         
         # Get all skills offered by this tutor
         offered_skills = (OfferedSkill.objects
                          .filter(user=tutor, is_active=True)
                          .select_related('skill', 'skill__category')
+                         .only('id', 'proficiency_level', 'description', 'years_of_experience',
+                               'teaching_preference', 'total_sessions', 'average_rating',
+                               'skill__name', 'skill__category__name')
                          .order_by('-average_rating', 'skill__name'))
         
-        context['offered_skills'] = offered_skills
+        # Overall rating and sessions are kept on the profile by skills/signals.py
+        profile = getattr(tutor, 'profile', None)
+        if profile is not None:
+            context['overall_rating'] = profile.average_rating_as_teacher
+            context['total_sessions'] = profile.total_sessions_taught
+        else:
+            stats = get_teacher_stats(tutor.pk)
+            context['overall_rating'] = stats['avg_rating']
+            context['total_sessions'] = stats['total_sessions']
         
-        # Calculate overall rating
-        overall_rating = offered_skills.aggregate(
-            avg_rating=Avg('average_rating'),
-            total_sessions=Count('total_sessions')
-        )
-        context['overall_rating'] = overall_rating['avg_rating'] or 0
-        context['total_sessions'] = sum([skill.total_sessions for skill in offered_skills])
+        # Materialize once; the template checks, counts and iterates the list
+        context['offered_skills'] = list(offered_skills)
         
         return context